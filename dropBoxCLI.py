@@ -1,7 +1,15 @@
 import os
 import dropbox
+import hashlib
 import json
+import heapq
+import operator
+import sqlite3
+import sys
+import threading
 import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -11,73 +19,361 @@ DROPBOX_APP_KEY = os.getenv("DROPBOX_APP_KEY")
 DROPBOX_APP_SECRET = os.getenv("DROPBOX_APP_SECRET")
 DROPBOX_REFRESH_TOKEN = os.getenv("DROPBOX_REFRESH_TOKEN")
 
+MAX_WORKERS = 20  # Concurrent API requests; Dropbox rate-limits around 100 req/s
+MAX_BACKOFF = 60  # Longest wait between rate-limited retries, in seconds
+MEMBERS_PAGE_SIZE = 50
+PREFETCH_WORKERS = 8
+
+# LRU cache of folder listings, keyed by (client id, path)
+_ENTRY_CACHE = OrderedDict()
+_ENTRY_CACHE_LOCK = threading.Lock()  # Prefetch threads share the cache
+_CACHE_MAX = 128
+# Prefetched listings live in their own tier so they never evict visited ones
+_PREFETCH_CACHE = OrderedDict()
+_PREFETCH_MAX = 100  # About two screens of shown subfolders
+
+# Persistent metadata cache, reused across sessions and synced with list_folder cursors
+CACHE_DB_PATH = os.path.expanduser("~/.dropbox-cli-cache.db")
+_CACHE_DB = None
+_CACHE_DB_LOCK = threading.Lock()
+CACHE_MAX_AGE = 30 * 24 * 3600  # Forget folders not visited for this many seconds
+_ACCOUNT_IDS = {}  # client id -> Dropbox account id, for keying the persistent cache
+
+# Accounts seen on earlier launches, keyed by a hash of the refresh token
+STATE_PATH = os.path.expanduser("~/.dropbox-cli-state.json")
+
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
 def format_file_size(size_bytes):
     """Format file size in a human-readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} PB"
-
-def list_folder_contents(dbx, path="", max_items=50):
-    """List folder contents with a limit on the number of items shown."""
-    try:
-        entries = dbx.files_list_folder(path).entries
-        
-        # Sort entries: folders first, then files, both alphabetically
-        folders = sorted([e for e in entries if isinstance(e, dropbox.files.FolderMetadata)], key=lambda e: e.name.lower())
-        files = sorted([e for e in entries if isinstance(e, dropbox.files.FileMetadata)], key=lambda e: e.name.lower())
-        
-        # Combine and limit
-        all_entries = folders + files
-        shown_entries = all_entries[:max_items]
+    # Each unit spans 10 bits, so the bit length picks the unit directly
+    unit_idx = min(len(_UNITS) - 1, max(0, (int(size_bytes).bit_length() - 1) // 10))
+    return f"{size_bytes / (1 << (10 * unit_idx)):.1f} {_UNITS[unit_idx]}"
+
+def _with_backoff(call, *args, **kwargs):
+    """Call a Dropbox API method, backing off and retrying until it is not rate limited.
+    
+    Like the SDK's default, rate limits are retried without a cap, so callers
+    only ever see the call's own errors.
+    """
+    attempt = 0
+    while True:
+        try:
+            return call(*args, **kwargs)
+        except dropbox.exceptions.RateLimitError as err:
+            time.sleep(err.backoff or min(2 ** attempt, MAX_BACKOFF))
+            attempt += 1
+
+def _iter_pages(dbx, path="", cursor=None):
+    """Yield every page of a folder listing, or of the changes since cursor."""
+    if cursor:
+        result = _with_backoff(dbx.files_list_folder_continue, cursor)
+    else:
+        result = _with_backoff(dbx.files_list_folder, path, limit=2000)
+    yield result
+    while result.has_more:
+        result = _with_backoff(dbx.files_list_folder_continue, result.cursor)
+        yield result
+
+def _list_with_cursor(dbx, path="", cursor=None):
+    """Return (entries, cursor) for a folder, or only the changes since cursor."""
+    entries = []
+    for page in _iter_pages(dbx, path, cursor):
+        entries.extend(page.entries)
+    return entries, page.cursor
+
+def _remember_account(dbx, account_id):
+    """Record which account a client belongs to so its listings can be persisted."""
+    _ACCOUNT_IDS[id(dbx)] = account_id
+
+def _cache_db():
+    """Open the persistent metadata cache, creating its tables on first use."""
+    global _CACHE_DB
+    if _CACHE_DB is None:
+        # Listings can cover every team member's files; keep them private to this user
+        os.close(os.open(CACHE_DB_PATH, os.O_CREAT | os.O_WRONLY, 0o600))
+        os.chmod(CACHE_DB_PATH, 0o600)
+        db = sqlite3.connect(CACHE_DB_PATH, check_same_thread=False)
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                account_id TEXT NOT NULL,
+                path TEXT NOT NULL,
+                name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                size INTEGER,
+                path_lower TEXT NOT NULL,
+                path_display TEXT,
+                PRIMARY KEY (account_id, path_lower)
+            );
+            CREATE INDEX IF NOT EXISTS entries_by_folder ON entries (account_id, path);
+            CREATE TABLE IF NOT EXISTS cursors (
+                account_id TEXT NOT NULL,
+                path TEXT NOT NULL,
+                cursor TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (account_id, path)
+            );
+        """)
         
-        # Display entries
-        for i, entry in enumerate(shown_entries):
+        # Expire folders not visited recently, so the cache cannot grow forever
+        with db:
+            cutoff = time.time() - CACHE_MAX_AGE
+            db.execute(
+                "DELETE FROM entries WHERE (account_id, path) IN"
+                " (SELECT account_id, path FROM cursors WHERE fetched_at < ?)",
+                (cutoff,)
+            )
+            db.execute("DELETE FROM cursors WHERE fetched_at < ?", (cutoff,))
+        _CACHE_DB = db
+    return _CACHE_DB
+
+def _purge_subtree(db, account_id, folder):
+    """Delete a removed entry's row and everything cached beneath it."""
+    prefix = folder + "/"
+    db.execute(
+        "DELETE FROM entries WHERE account_id = ?"
+        " AND (path_lower = ? OR path = ? OR substr(path, 1, ?) = ?)",
+        (account_id, folder, folder, len(prefix), prefix)
+    )
+    db.execute(
+        "DELETE FROM cursors WHERE account_id = ? AND (path = ? OR substr(path, 1, ?) = ?)",
+        (account_id, folder, len(prefix), prefix)
+    )
+
+def _entry_from_row(name, kind, size, path_lower, path_display):
+    """Rebuild a metadata object from a persisted entries row."""
+    if kind == "folder":
+        return dropbox.files.FolderMetadata(name=name, path_lower=path_lower, path_display=path_display)
+    return dropbox.files.FileMetadata(name=name, size=size, path_lower=path_lower, path_display=path_display)
+
+def _persisted_list(dbx, account_id, path=""):
+    """Return a folder's entries from the persistent cache, syncing only the changes.
+    
+    A stored cursor is continued to fetch just what changed since the last
+    visit; without one, or once Dropbox rejects it, the folder is listed in full.
+    """
+    with _CACHE_DB_LOCK:
+        row = _cache_db().execute(
+            "SELECT cursor FROM cursors WHERE account_id = ? AND path = ?",
+            (account_id, path)
+        ).fetchone()
+    
+    full_listing = True
+    if row:
+        try:
+            changes, cursor = _list_with_cursor(dbx, path, row[0])
+            full_listing = False
+        except dropbox.exceptions.ApiError:
+            pass  # Cursor expired or reset; fall back to a full listing
+    if full_listing:
+        changes, cursor = _list_with_cursor(dbx, path)
+    
+    with _CACHE_DB_LOCK, _cache_db() as db:
+        if full_listing:
+            # Subfolders missing from the fresh listing were removed while unwatched
+            listed = {e.path_lower for e in changes}
+            for (folder,) in db.execute(
+                "SELECT path_lower FROM entries WHERE account_id = ? AND path = ? AND kind = 'folder'",
+                (account_id, path)
+            ).fetchall():
+                if folder not in listed:
+                    _purge_subtree(db, account_id, folder)
+            db.execute("DELETE FROM entries WHERE account_id = ? AND path = ?", (account_id, path))
+        for entry in changes:
             if isinstance(entry, dropbox.files.FolderMetadata):
-                print(f"{i+1}. 📁 {entry.name}")
+                kind, size = "folder", None
+            elif isinstance(entry, dropbox.files.FileMetadata):
+                kind, size = "file", entry.size
             else:
-                size_str = format_file_size(entry.size)
-                print(f"{i+1}. 📄 {entry.name} ({size_str})")
-        
-        # Show if there are more items
-        if len(all_entries) > max_items:
-            print(f"... and {len(all_entries) - max_items} more items")
-        
-        return folders, files
+                _purge_subtree(db, account_id, entry.path_lower)
+                continue
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (account_id, path, entry.name, kind, size, entry.path_lower, entry.path_display)
+            )
+        db.execute(
+            "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?, ?)",
+            (account_id, path, cursor, time.time())
+        )
+        rows = db.execute(
+            "SELECT name, kind, size, path_lower, path_display FROM entries"
+            " WHERE account_id = ? AND path = ?",
+            (account_id, path)
+        ).fetchall()
+    
+    return [_entry_from_row(*row) for row in rows]
+
+def _cached_list(dbx, path="", prefetch=False):
+    """Return all entries of a folder, reusing a recent listing when available.
+    
+    Misses in the in-memory LRU go through the persistent cache when the
+    client's account is known, and straight to the API otherwise. Prefetched
+    listings are kept in a separate tier and promoted to the LRU when read.
+    """
+    key = (id(dbx), path)
+    with _ENTRY_CACHE_LOCK:
+        if key in _ENTRY_CACHE:
+            if not prefetch:
+                _ENTRY_CACHE.move_to_end(key)
+            return _ENTRY_CACHE[key]
+        if key in _PREFETCH_CACHE:
+            if prefetch:
+                return _PREFETCH_CACHE[key]
+            entries = _PREFETCH_CACHE.pop(key)
+            _ENTRY_CACHE[key] = entries
+            if len(_ENTRY_CACHE) > _CACHE_MAX:
+                _ENTRY_CACHE.popitem(last=False)
+            return entries
+    
+    entries = None
+    account_id = _ACCOUNT_IDS.get(id(dbx))
+    if account_id is not None:
+        try:
+            entries = _persisted_list(dbx, account_id, path)
+        except (sqlite3.Error, OSError):
+            pass  # Unusable cache file; list from the API instead
+    if entries is None:
+        entries, _ = _list_with_cursor(dbx, path)
+    cache, limit = (_PREFETCH_CACHE, _PREFETCH_MAX) if prefetch else (_ENTRY_CACHE, _CACHE_MAX)
+    with _ENTRY_CACHE_LOCK:
+        cache[key] = entries
+        if len(cache) > limit:
+            cache.popitem(last=False)
+    return entries
+
+def _invalidate_cache(dbx, path=""):
+    """Drop the cached listing of a folder so the next read refetches it."""
+    with _ENTRY_CACHE_LOCK:
+        _ENTRY_CACHE.pop((id(dbx), path), None)
+        _PREFETCH_CACHE.pop((id(dbx), path), None)
+
+def iter_all_entries(dbx, path=""):
+    """Yield every entry below a folder, walking top-level subfolders concurrently.
+    
+    Subfolders are walked page by page with recursive listings, so only the
+    frontier and the pages in flight are held in memory, whatever the tree size.
+    """
+    top_entries = _cached_list(dbx, path)
+    yield from top_entries
+    
+    frontier = deque(e.path_lower for e in top_entries if isinstance(e, dropbox.files.FolderMetadata))
+    pending = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        while frontier or pending:
+            while frontier and len(pending) < MAX_WORKERS:
+                folder = frontier.popleft()
+                future = pool.submit(_with_backoff, dbx.files_list_folder, folder, recursive=True, limit=2000)
+                pending[future] = folder
             
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder = pending.pop(future)
+                try:
+                    result = future.result()
+                except dropbox.exceptions.ApiError as err:
+                    print(f"Error accessing {folder}: {err}")
+                    continue
+                
+                # Request the next page before handing this one to the caller
+                if result.has_more:
+                    pending[pool.submit(_with_backoff, dbx.files_list_folder_continue, result.cursor)] = folder
+                
+                for entry in result.entries:
+                    # Recursive listings include the folder being walked
+                    if entry.path_lower != folder:
+                        yield entry
+
+def _first_by_name(entries, count):
+    """Return the first entries in case-insensitive name order, without a full sort."""
+    if count <= 0:
+        return []
+    decorated = [(e.name.casefold(), e) for e in entries]
+    return [e for _, e in heapq.nsmallest(count, decorated, key=operator.itemgetter(0))]
+
+def scan_folder(dbx, path="", max_items=50):
+    """Fetch a folder once and return the folders and files to show plus quick stats.
+    
+    Only the first max_items entries (folders first, then files, both
+    alphabetically) are returned; the stats always cover the whole folder.
+    """
+    try:
+        entries = _cached_list(dbx, path)
     except dropbox.exceptions.ApiError as err:
         print(f"Error accessing {path}: {err}")
-        return [], []
+        return [], [], {"error": str(err)}
+    
+    # Partition in one pass, with hot names bound to locals
+    folders = []
+    files = []
+    add_folder = folders.append
+    add_file = files.append
+    _isinstance = isinstance
+    FolderMetadata = dropbox.files.FolderMetadata
+    FileMetadata = dropbox.files.FileMetadata
+    total_size = 0
+    for entry in entries:
+        if _isinstance(entry, FolderMetadata):
+            add_folder(entry)
+        elif _isinstance(entry, FileMetadata):
+            add_file(entry)
+            total_size += entry.size
+    
+    stats = {
+        "folders": len(folders),
+        "files": len(files),
+        "total_size": total_size,
+        "total_size_formatted": format_file_size(total_size)
+    }
+    
+    # Select entries: folders first, then files, both alphabetically
+    shown_folders = _first_by_name(folders, max_items)
+    shown_files = _first_by_name(files, max_items - len(shown_folders))
+    
+    return shown_folders, shown_files, stats
+
+def print_folder_contents(folders, files, stats):
+    """Print the folders and files selected by scan_folder."""
+    # Display entries
+    for i, entry in enumerate(folders + files):
+        if isinstance(entry, dropbox.files.FolderMetadata):
+            print(f"{i+1}. 📁 {entry.name}")
+        else:
+            size_str = format_file_size(entry.size)
+            print(f"{i+1}. 📄 {entry.name} ({size_str})")
+    
+    # Show if there are more items
+    hidden = stats.get("folders", 0) + stats.get("files", 0) - len(folders) - len(files)
+    if hidden > 0:
+        print(f"... and {hidden} more items")
 
-def get_folder_stats(dbx, path=""):
-    """Get quick statistics for the current folder."""
+def _find_folder(dbx, path, name):
+    """Find a subfolder by case-insensitive name, including ones not shown."""
+    name = name.casefold()
     try:
-        entries = dbx.files_list_folder(path).entries
-        
-        folders = [e for e in entries if isinstance(e, dropbox.files.FolderMetadata)]
-        files = [e for e in entries if isinstance(e, dropbox.files.FileMetadata)]
-        
-        total_size = sum(f.size for f in files)
-        
-        stats = {
-            "folders": len(folders),
-            "files": len(files),
-            "total_size": total_size,
-            "total_size_formatted": format_file_size(total_size)
-        }
-        
-        return stats
-    except dropbox.exceptions.ApiError as err:
-        print(f"Error getting stats for {path}: {err}")
-        return {"error": str(err)}
+        entries = _cached_list(dbx, path)
+    except dropbox.exceptions.ApiError:
+        return None
+    for entry in entries:
+        if isinstance(entry, dropbox.files.FolderMetadata) and entry.name.casefold() == name:
+            return entry
+    return None
 
 def list_team_members(team_dbx):
     """List all members in the Dropbox team."""
     try:
-        members = team_dbx.team_members_list().members
+        result = _with_backoff(team_dbx.team_members_list, limit=1000)
+        members = list(result.members)
+        while result.has_more:
+            result = _with_backoff(team_dbx.team_members_list_continue, result.cursor)
+            members.extend(result.members)
+        
         print("\nTeam Members:")
         for i, member in enumerate(members):
+            # Page the output so large teams don't flood the terminal
+            if i and i % MEMBERS_PAGE_SIZE == 0:
+                more = input(f"-- {len(members) - i} more, press Enter to show them or q to stop -- ")
+                if more.strip().lower() == "q":
+                    break
             profile = member.profile
             print(f"{i+1}. {profile.name.display_name} ({profile.email})")
         return members
@@ -85,113 +381,135 @@ def list_team_members(team_dbx):
         print(f"Error listing team members: {e}")
         return []
 
-def select_team_member(team_dbx):
-    """List team members and let user select one."""
+def choose_team_member(team_dbx):
+    """List team members and return the one the user picks, or None."""
     members = list_team_members(team_dbx)
     
     if not members:
         print("No team members found or error occurred.")
         return None
     
-    try:
-        choice = int(input("\nEnter the number of the team member to explore (or 0 to exit): "))
+    # Re-prompt on bad input without fetching the member list again
+    while True:
+        try:
+            choice = int(input("\nEnter the number of the team member to explore (or 0 to exit): "))
+        except ValueError:
+            print("Please enter a valid number.")
+            continue
+        
         if choice == 0:
             return None
         if 1 <= choice <= len(members):
             selected_member = members[choice-1]
-            member_id = selected_member.profile.team_member_id
             print(f"Selected: {selected_member.profile.name.display_name}")
-            return team_dbx.as_user(member_id)
-        else:
-            print("Invalid selection.")
-            return select_team_member(team_dbx)
-    except ValueError:
-        print("Please enter a valid number.")
-        return select_team_member(team_dbx)
+            return selected_member
+        print("Invalid selection.")
+
+def _clear_screen():
+    """Clear the terminal with ANSI escapes instead of spawning a shell."""
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
 def interactive_explorer(dbx, current_path=""):
     """Interactive explorer for navigating Dropbox folders."""
-    while True:
-        # Clear screen (optional)
-        os.system('cls' if os.name == 'nt' else 'clear')
-        
-        # Show current path
-        print(f"\nCurrent path: {current_path or '/'}")
-        
-        # Get quick stats
-        stats = get_folder_stats(dbx, current_path)
-        print(f"Contents: {stats.get('folders', 0)} folders, {stats.get('files', 0)} files, {stats.get('total_size_formatted', '0 B')}")
-        
-        # List contents
-        print("\nContents:")
-        folders, files = list_folder_contents(dbx, current_path)
-        
-        # Show options
-        print("\nOptions:")
-        print("  cd <number> - Open folder by number")
-        print("  cd .. - Go up one level")
-        print("  cd <name> - Open folder by name")
-        print("  stats - Show detailed statistics for this folder")
-        print("  exit - Exit explorer")
-        
-        # Get command
-        cmd = input("\nEnter command: ").strip()
-        
-        if cmd.lower() == "exit":
-            break
-        
-        elif cmd.lower() == "stats":
-            # Show detailed stats
-            detailed_stats = get_detailed_stats(dbx, current_path)
-            print("\nDetailed Statistics:")
-            print(f"Total Folders: {detailed_stats['total_folders']}")
-            print(f"Total Files: {detailed_stats['total_files']}")
-            print(f"Total Size: {detailed_stats['total_size_formatted']}")
+    prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+    prefetches = {}  # folder path -> prefetch future
+    try:
+        while True:
+            # Clear screen (optional)
+            _clear_screen()
             
-            print("\nFile Types:")
-            for ext, count in sorted(detailed_stats['file_types'].items(), key=lambda x: x[1], reverse=True)[:10]:
-                print(f"  {ext}: {count} files")
+            # Show current path
+            print(f"\nCurrent path: {current_path or '/'}")
             
-            print("\nLargest Files:")
-            for file in detailed_stats['largest_files'][:5]:
-                print(f"  {file['name']} ({file['size_formatted']})")
+            # Cancel the previous screen's prefetches that have not started, so
+            # they cannot queue ahead of this folder; keep only those in flight
+            prefetches = {p: f for p, f in prefetches.items() if not f.cancel() and not f.done()}
             
-            input("\nPress Enter to continue...")
+            # Let an in-flight prefetch of this folder finish rather than listing it twice
+            pending = prefetches.pop(current_path, None)
+            if pending:
+                wait([pending])
             
-        elif cmd.startswith("cd "):
-            target = cmd[3:].strip()
+            # Fetch the folder once for both the quick stats and the listing
+            folders, files, stats = scan_folder(dbx, current_path)
+            print(f"Contents: {stats.get('folders', 0)} folders, {stats.get('files', 0)} files, {stats.get('total_size_formatted', '0 B')}")
             
-            # Go up one level
-            if target == "..":
-                if current_path:
-                    current_path = os.path.dirname(current_path)
-                continue
+            # List contents
+            print("\nContents:")
+            print_folder_contents(folders, files, stats)
             
-            # Try to navigate by number
-            try:
-                index = int(target) - 1
-                if 0 <= index < len(folders):
-                    current_path = folders[index].path_lower
-                else:
-                    print("Invalid folder number.")
-                    input("Press Enter to continue...")
-            except ValueError:
-                # Try to navigate by name
-                found = False
-                for folder in folders:
-                    if folder.name.lower() == target.lower():
-                        current_path = folder.path_lower
-                        found = True
-                        break
+            # Prefetch the shown subfolders while the user reads this screen
+            for folder in folders:
+                if folder.path_lower not in prefetches:
+                    prefetches[folder.path_lower] = prefetch_pool.submit(_cached_list, dbx, folder.path_lower, prefetch=True)
+            
+            # Show options
+            print("\nOptions:")
+            print("  cd <number> - Open folder by number")
+            print("  cd .. - Go up one level")
+            print("  cd <name> - Open folder by name")
+            print("  stats - Show detailed statistics for this folder")
+            print("  refresh - Reload this folder from Dropbox")
+            print("  exit - Exit explorer")
+            
+            # Get command
+            cmd = input("\nEnter command: ").strip()
+            
+            if cmd.lower() == "exit":
+                break
+            
+            elif cmd.lower() == "refresh":
+                _invalidate_cache(dbx, current_path)
+            
+            elif cmd.lower() == "stats":
+                # Show detailed stats
+                detailed_stats = get_detailed_stats(dbx, current_path)
+                print("\nDetailed Statistics:")
+                print(f"Total Folders: {detailed_stats['total_folders']}")
+                print(f"Total Files: {detailed_stats['total_files']}")
+                print(f"Total Size: {detailed_stats['total_size_formatted']}")
+                
+                print("\nFile Types:")
+                for ext, count in detailed_stats['file_types'].most_common(10):
+                    print(f"  {ext}: {count} files")
                 
-                if not found:
-                    print(f"Folder '{target}' not found.")
-                    input("Press Enter to continue...")
+                print("\nLargest Files:")
+                for file in detailed_stats['largest_files'][:5]:
+                    print(f"  {file['name']} ({file['size_formatted']})")
+                
+                input("\nPress Enter to continue...")
+                
+            elif cmd.startswith("cd "):
+                target = cmd[3:].strip()
+                
+                # Go up one level
+                if target == "..":
+                    if current_path:
+                        current_path = os.path.dirname(current_path)
+                    continue
+                
+                # Try to navigate by number
+                try:
+                    index = int(target) - 1
+                    if 0 <= index < len(folders):
+                        current_path = folders[index].path_lower
+                    else:
+                        print("Invalid folder number.")
+                        input("Press Enter to continue...")
+                except ValueError:
+                    # Try to navigate by name, including folders beyond the shown page
+                    folder = _find_folder(dbx, current_path, target)
+                    if folder:
+                        current_path = folder.path_lower
+                    else:
+                        print(f"Folder '{target}' not found.")
+                        input("Press Enter to continue...")
+    finally:
+        prefetch_pool.shutdown(wait=False, cancel_futures=True)
 
 def get_detailed_stats(dbx, path=""):
     """Get detailed statistics for a folder."""
-    from collections import Counter
-    
     stats = {
         "total_folders": 0,
         "total_files": 0,
@@ -199,59 +517,108 @@ def get_detailed_stats(dbx, path=""):
         "file_types": Counter(),
         "largest_files": []
     }
-    
-    folders_to_process = [path]
-    processed_count = 0
+    largest_heap = []  # min-heap of (size, name, path) for the 10 largest files
     
     print("Analyzing folder structure (this may take a moment)...")
     
-    while folders_to_process and processed_count < 1000:  # Limit to prevent too long processing
-        current_folder = folders_to_process.pop(0)
-        processed_count += 1
-        
-        try:
-            entries = dbx.files_list_folder(current_folder).entries
-            
-            for entry in entries:
-                if isinstance(entry, dropbox.files.FolderMetadata):
-                    stats["total_folders"] += 1
-                    folders_to_process.append(entry.path_lower)
-                elif isinstance(entry, dropbox.files.FileMetadata):
-                    stats["total_files"] += 1
-                    stats["total_size"] += entry.size
-                    
-                    # Count file types
-                    file_ext = os.path.splitext(entry.name.lower())[1]
-                    if file_ext:
-                        stats["file_types"][file_ext] += 1
-                    else:
-                        stats["file_types"]["no_extension"] += 1
-                    
-                    # Track largest files
-                    file_info = {
-                        "name": entry.name,
-                        "path": entry.path_display,
-                        "size": entry.size,
-                        "size_formatted": format_file_size(entry.size)
-                    }
-                    
-                    stats["largest_files"].append(file_info)
-                    stats["largest_files"] = sorted(stats["largest_files"], 
-                                                   key=lambda x: x["size"], 
-                                                   reverse=True)[:10]
-                    
-        except dropbox.exceptions.ApiError as err:
-            print(f"Error accessing {current_folder}: {err}")
+    # Bind hot names to locals; the loop runs once per entry in the whole tree
+    _isinstance = isinstance
+    _splitext = os.path.splitext
+    _heappush = heapq.heappush
+    _heappop = heapq.heappop
+    FolderMetadata = dropbox.files.FolderMetadata
+    FileMetadata = dropbox.files.FileMetadata
+    file_types = stats["file_types"]
     
-    if processed_count >= 1000:
-        print("Note: Analysis limited to 1000 folders to prevent timeout.")
+    try:
+        for entry in iter_all_entries(dbx, path):
+            if _isinstance(entry, FolderMetadata):
+                stats["total_folders"] += 1
+            elif _isinstance(entry, FileMetadata):
+                stats["total_files"] += 1
+                stats["total_size"] += entry.size
+                
+                # Count file types
+                file_ext = _splitext(entry.name)[1].lower()
+                if file_ext:
+                    file_types[file_ext] += 1
+                else:
+                    file_types["no_extension"] += 1
+                
+                # Track largest files
+                _heappush(largest_heap, (entry.size, entry.name, entry.path_display))
+                if len(largest_heap) > 10:
+                    _heappop(largest_heap)
+                
+    except dropbox.exceptions.ApiError as err:
+        print(f"Error accessing {path}: {err}")
     
-    stats["file_types"] = dict(stats["file_types"])
+    stats["largest_files"] = [
+        {
+            "name": name,
+            "path": file_path,
+            "size": size,
+            "size_formatted": format_file_size(size)
+        }
+        for size, name, file_path in sorted(largest_heap, reverse=True)
+    ]
     stats["total_size_formatted"] = format_file_size(stats["total_size"])
     
     return stats
 
+def _state_key():
+    """Key the state file by a hash of the refresh token."""
+    return hashlib.sha256((DROPBOX_REFRESH_TOKEN or "").encode()).hexdigest()
+
+def _read_state():
+    """Load the state file, treating a missing or corrupt file as empty."""
+    try:
+        with open(STATE_PATH) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+def _write_state(state):
+    """Save the state file, ignoring failures."""
+    try:
+        with open(os.open(STATE_PATH, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600), "w") as f:
+            json.dump(state, f)
+        os.chmod(STATE_PATH, 0o600)
+    except OSError:
+        pass  # The state file is only an optimization
+
+def load_account(dbx, state_key):
+    """Return (account_id, display_name), skipping the API call if seen before."""
+    state = _read_state()
+    cached = state.get(state_key)
+    if isinstance(cached, dict) and isinstance(cached.get("id"), str) and isinstance(cached.get("name"), str):
+        return cached["id"], cached["name"]
+    
+    # Get account information to verify connection
+    account = dbx.users_get_current_account()
+    state[state_key] = {"id": account.account_id, "name": account.name.display_name}
+    _write_state(state)
+    return account.account_id, account.name.display_name
+
+def forget_account(state_key):
+    """Drop a cached account so the next launch verifies it with Dropbox again."""
+    state = _read_state()
+    if state.pop(state_key, None) is not None:
+        _write_state(state)
+
+def explore_account(dbx, account_id, display_name):
+    """Run the explorer on a client whose account is already known."""
+    _remember_account(dbx, account_id)
+    print(f"Connected to Dropbox account: {display_name}")
+    
+    # Start interactive explorer
+    interactive_explorer(dbx)
+
 def main():
+    if os.name == 'nt':
+        os.system('')  # Enables ANSI escape handling in the Windows console
+    
     print("Connecting to Dropbox...")
     try:
         # Try to create a team client first
@@ -259,21 +626,23 @@ def main():
             team_dbx = dropbox.DropboxTeam(
                 app_key=DROPBOX_APP_KEY,
                 app_secret=DROPBOX_APP_SECRET,
-                oauth2_refresh_token=DROPBOX_REFRESH_TOKEN
+                oauth2_refresh_token=DROPBOX_REFRESH_TOKEN,
+                max_retries_on_rate_limit=0  # _with_backoff owns rate-limit retries
             )
             
             # List team members and let user select one
-            user_client = select_team_member(team_dbx)
-            if not user_client:
+            member = choose_team_member(team_dbx)
+            if not member:
                 print("No user selected. Exiting.")
                 return
-                
-            # Get account information to verify connection
-            account = user_client.users_get_current_account()
-            print(f"Connected to Dropbox account: {account.name.display_name}")
             
-            # Start interactive explorer
-            interactive_explorer(user_client)
+            # The member profile already names the account; no lookup needed
+            profile = member.profile
+            explore_account(
+                team_dbx.as_user(profile.team_member_id),
+                profile.account_id,
+                profile.name.display_name
+            )
             
         except Exception as e:
             print(f"Team access failed, trying individual access: {e}")
@@ -281,13 +650,17 @@ def main():
             dbx = dropbox.Dropbox(
                 app_key=DROPBOX_APP_KEY,
                 app_secret=DROPBOX_APP_SECRET,
-                oauth2_refresh_token=DROPBOX_REFRESH_TOKEN
+                oauth2_refresh_token=DROPBOX_REFRESH_TOKEN,
+                max_retries_on_rate_limit=0  # _with_backoff owns rate-limit retries
             )
-            account = dbx.users_get_current_account()
-            print(f"Connected to Dropbox account: {account.name.display_name}")
-            
-            # Start interactive explorer
-            interactive_explorer(dbx)
+            state_key = _state_key()
+            account_id, display_name = load_account(dbx, state_key)
+            try:
+                explore_account(dbx, account_id, display_name)
+            except dropbox.exceptions.AuthError:
+                # The cached account may be stale; revalidate on the next launch
+                forget_account(state_key)
+                raise
             
     except dropbox.exceptions.AuthError as e:
         print(f"Authentication error: {e}")